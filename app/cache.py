@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Size-bounded least recently used cache whose entries expire after a TTL"""
+
+    def __init__(self, maxsize, ttl):
+        """
+        :param maxsize: The maximum number of entries kept in the cache
+        :param ttl: The number of seconds after which an entry expires
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Gets an entry from the cache and marks it as most recently used
+
+        :param key: The key of the entry
+        :param default: The value returned when the entry is missing or expired
+        :return: The cached value, or `default`
+        """
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+
+            expires, value = self.entries[key]
+            if time.monotonic() >= expires:
+                del self.entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key, default=None):
+        """Gets an unexpired entry without updating its recency or the statistics
+
+        :param key: The key of the entry
+        :param default: The value returned when the entry is missing or expired
+        :return: The cached value, or `default`
+        """
+        with self.lock:
+            if key not in self.entries:
+                return default
+
+            expires, value = self.entries[key]
+            if time.monotonic() >= expires:
+                return default
+
+            return value
+
+    def put(self, key, value):
+        """Puts an entry in the cache, evicting the least recently used entry when full
+
+        :param key: The key of the entry
+        :param value: The value to cache
+        :return: None
+        """
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Removes an entry from the cache, or every entry when no key is given
+
+        :param key: The key of the entry to remove
+        :return: None
+        """
+        with self.lock:
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    def stats(self):
+        """Gets the usage statistics of the cache
+
+        :return: Dictionary of hits, misses, evictions, expirations and size
+        """
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self.entries),
+            }
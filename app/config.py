@@ -15,3 +15,22 @@ def map_level(level):
 LOGGING_LEVEL = map_level(os.environ.get("LOGGING_LEVEL", "debug"))
 PROCESSED_BUCKET_NAME = os.environ.get("BUCKET_NAME", "pdx-schedule-processed-data")
 UNPROCESSED_BUCKET_NAME = os.environ.get("BUCKET_NAME", "pdx-schedule-unprocessed-data")
+FULL_SNAPSHOT_INTERVAL = int(os.environ.get("FULL_SNAPSHOT_INTERVAL", 24))
+LOOKUP_BUDGET = float(os.environ.get("LOOKUP_BUDGET", 480))
+RATINGS_CACHE_BLOB_NAME = os.environ.get(
+    "RATINGS_CACHE_BLOB_NAME", "cache/ratings.json"
+)
+INSTRUCTOR_CACHE_SIZE = int(os.environ.get("INSTRUCTOR_CACHE_SIZE", 4096))
+INSTRUCTOR_CACHE_TTL = float(os.environ.get("INSTRUCTOR_CACHE_TTL", 6 * 60 * 60))
+RMP_REQUEST_TIMEOUT = float(os.environ.get("RMP_REQUEST_TIMEOUT", 10))
+RMP_TRANSPORT = os.environ.get("RMP_TRANSPORT", "http")
+RMP_CASSETTE = os.environ.get("RMP_CASSETTE", "ratemyprofessors.cassette.jsonl")
+RMP_REPLAY_LATENCY = float(os.environ.get("RMP_REPLAY_LATENCY", 0))
+RMP_REPLAY_JITTER = float(os.environ.get("RMP_REPLAY_JITTER", 0))
+RMP_REPLAY_ERROR_RATE = float(os.environ.get("RMP_REPLAY_ERROR_RATE", 0))
+FUNCTION_TIMEOUT = float(os.environ.get("FUNCTION_TIMEOUT", 540))
+MERGE_BUDGET = float(os.environ.get("MERGE_BUDGET", 120))
+RMP_REPLAY_SEED = os.environ.get("RMP_REPLAY_SEED")
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", 1))
+SHARD_MODE = os.environ.get("SHARD_MODE", "cloud")
+WORK_BUCKET_NAME = os.environ.get("WORK_BUCKET_NAME", "pdx-schedule-transform-work")
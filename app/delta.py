@@ -0,0 +1,167 @@
+from collections import OrderedDict
+
+DELTA_DIRECTORY = "deltas"
+
+
+def is_delta(blob_name):
+    """Checks whether a blob name refers to a delta rather than a full snapshot
+
+    :param blob_name: The name of the blob in the processed bucket
+    :return: True if the blob is a delta object
+    """
+    return f"/{DELTA_DIRECTORY}/" in blob_name
+
+
+def delta_blob_name(term_code, filename):
+    """Generates the name of a delta blob for a term
+
+    :param term_code: The term code the delta belongs to
+    :param filename: The timestamped filename of the delta
+    :return: The blob name in the format term_code/deltas/filename
+    """
+    return f"{term_code}/{DELTA_DIRECTORY}/{filename}"
+
+
+def course_key(course):
+    """Generates the key identifying a course row across versions
+
+    :param course: The dictionary representing a course
+    :return: A key made of the CRN and the instructor full name
+    """
+    instructor = course.get("instructor", "TBD")
+    if isinstance(instructor, dict):
+        instructor = instructor.get("fullName", "TBD")
+
+    return f"{course.get('crn')}/{instructor}"
+
+
+def index_courses(courses):
+    """Index a list of course rows by their course key
+
+    Rows sharing a CRN and instructor are disambiguated by their occurrence.
+
+    :param courses: List of dictionaries representing courses
+    :return: Ordered dictionary of course keys and their course rows
+    """
+    indexed = OrderedDict()
+    for course in courses:
+        key = course_key(course)
+        occurrence = 1
+        unique_key = key
+        while unique_key in indexed:
+            occurrence += 1
+            unique_key = f"{key}#{occurrence}"
+
+        indexed[unique_key] = course
+
+    return indexed
+
+
+def diff(previous, current, base=None):
+    """Compares two versions of the processed contents
+
+    :param previous: Dictionary of term codes and course rows of the previous version
+    :param current: Dictionary of term codes and course rows of the current version
+    :param base: The name of the version the delta applies to
+    :return: A delta of the added, removed, changed and reordered course rows per term
+    """
+    assert isinstance(previous, dict), f"Expected dict but got {type(previous)}"
+    assert isinstance(current, dict), f"Expected dict but got {type(current)}"
+    delta = {
+        "base": base,
+        "terms": list(current.keys()),
+        "added": {},
+        "removed": {},
+        "changed": {},
+        "order": {},
+    }
+
+    for term_code in current.keys() | previous.keys():
+        previous_courses = index_courses(previous.get(term_code, []))
+        current_courses = index_courses(current.get(term_code, []))
+
+        added = OrderedDict(
+            (key, course)
+            for key, course in current_courses.items()
+            if key not in previous_courses
+        )
+        removed = [key for key in previous_courses if key not in current_courses]
+        changed = OrderedDict(
+            (key, course)
+            for key, course in current_courses.items()
+            if key in previous_courses and previous_courses[key] != course
+        )
+
+        if added:
+            delta["added"][term_code] = added
+        if removed:
+            delta["removed"][term_code] = removed
+        if changed:
+            delta["changed"][term_code] = changed
+
+        # Only record the order of the rows when it differs from the order `apply`
+        # produces by default, so unchanged and appended rows keep the delta compact
+        default_order = [key for key in previous_courses if key in current_courses]
+        default_order += list(added.keys())
+        if list(current_courses.keys()) != default_order:
+            delta["order"][term_code] = list(current_courses.keys())
+
+    return delta
+
+
+def is_empty(delta, previous):
+    """Checks whether a delta leaves the previous version unchanged
+
+    :param delta: The delta generated by `diff`
+    :param previous: Dictionary of term codes and course rows the delta is based on
+    :return: True if applying the delta would not change `previous`
+    """
+    return not (
+        delta["added"] or delta["removed"] or delta["changed"] or delta["order"]
+    ) and delta["terms"] == list(previous.keys())
+
+
+def apply(contents, delta):
+    """Applies a delta to a version of the processed contents
+
+    Rows are put in the order recorded by the delta. Without a recorded order, changed
+    rows keep their position and added rows are appended to their term.
+
+    :param contents: Dictionary of term codes and course rows the delta is based on
+    :param delta: The delta generated by `diff`
+    :return: A new dictionary of term codes and course rows
+    """
+    assert isinstance(contents, dict), f"Expected dict but got {type(contents)}"
+    applied = OrderedDict()
+
+    for term_code in delta["terms"]:
+        courses = index_courses(contents.get(term_code, []))
+
+        for key in delta["removed"].get(term_code, []):
+            courses.pop(key, None)
+        for key, course in delta["changed"].get(term_code, {}).items():
+            courses[key] = course
+        for key, course in delta["added"].get(term_code, {}).items():
+            courses[key] = course
+
+        order = delta.get("order", {}).get(term_code)
+        if order is None:
+            applied[term_code] = list(courses.values())
+        else:
+            applied[term_code] = [courses[key] for key in order]
+
+    return applied
+
+
+def rebuild(snapshot, deltas):
+    """Rebuilds a version from a full snapshot and the deltas that follow it
+
+    :param snapshot: Dictionary of term codes and course rows of the full snapshot
+    :param deltas: Iterable of deltas in the order they were generated
+    :return: The contents of the version after the last delta
+    """
+    contents = snapshot
+    for delta in deltas:
+        contents = apply(contents, delta)
+
+    return contents
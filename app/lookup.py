@@ -0,0 +1,75 @@
+"""Runs the instructor lookups of a local contents file without Cloud Storage
+
+The lookups go through the transport selected by `RMP_TRANSPORT`, so a cassette can be
+recorded and then replayed to load test the lookup path offline:
+
+    RMP_TRANSPORT=replay python -m app.lookup contents.json --shards 4 --repeat 3
+"""
+
+import argparse
+import json
+import time
+
+from app import config
+from app import main
+from app import scheduler
+from app import sharding
+from app.logger import logger
+
+
+def run_lookups(contents_json, shard_count=1, repeat=1):
+    """Rate the instructors of the contents and report how the lookups performed
+
+    Sharded lookups run in new local processes every time, so only unsharded repeats
+    are served by the in-process memo.
+
+    :param contents_json: The dictionary representing the JSON contents of the bucket
+    :param shard_count: The number of local processes to rate the instructors in
+    :param repeat: The number of times to rate the instructors
+    :return: List of reports of the duration, rated instructors and coverage
+    """
+    instructors = main.get_instructors(contents_json)
+    course_counts = scheduler.count_courses(contents_json)
+    ordered_instructors = scheduler.prioritize(instructors, course_counts, {})
+    shards = sharding.split(ordered_instructors, shard_count)
+    reports = []
+
+    for _ in range(repeat):
+        start = time.monotonic()
+        deadline = main.get_deadline(config.LOOKUP_BUDGET)
+
+        if len(shards) > 1:
+            result = main.rate_locally(shards, deadline)
+        else:
+            result = main.rate_shard(ordered_instructors, deadline)
+
+        report = {
+            "seconds": round(time.monotonic() - start, 3),
+            "rated": len(result["instructors"]),
+            "instructors": len(instructors),
+            "coverage": scheduler.coverage(result["instructors"], course_counts),
+        }
+        logger.info(f"Lookup report: {report}")
+        reports.append(report)
+
+    return reports
+
+
+def run():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("contents", help="path of a JSON file of unprocessed contents")
+    parser.add_argument("--shards", type=int, default=1, help="local processes to use")
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="times to run the lookups"
+    )
+    args = parser.parse_args()
+
+    with open(args.contents) as infile:
+        contents_json = json.load(infile)
+
+    reports = run_lookups(contents_json, args.shards, args.repeat)
+    print(json.dumps(reports, indent=2))
+
+
+if __name__ == "__main__":
+    run()
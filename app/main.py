@@ -1,8 +1,18 @@
 import json
+import time
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
+import requests
+
+from app import config
+from app import scheduler
+from app import sharding
 from app import storage
+from app import utils
 from app.logger import logger
+from app.ratemyprofessors import instructor_cache
 from app.ratemyprofessors import RateMyProfessors
 
 
@@ -26,16 +36,27 @@ def get_instructor(instructor):
     return RateMyProfessors.get_instructor(instructor)
 
 
-def rate_instructors(instructors):
+def rate_instructors(instructors, deadline=None, skip_errors=False):
     """Rate instructors according to their RateMyProfessor information
 
-    :param instructors: Set of instructors to rate
-    :return: List of dictionaries of instructor information
+    :param instructors: Set or ordered list of instructors to rate
+    :param deadline: The `time.monotonic` value after which no more instructors are rated
+    :param skip_errors: Whether to leave instructors unrated on any error, rather than
+                        only on failed requests
+    :return: List of dictionaries of instructor information, without the instructors
+             whose request failed
     """
-    assert isinstance(instructors, set)
+    assert isinstance(instructors, (set, list))
     rated = OrderedDict()
 
-    for instructor in instructors:
+    for index, instructor in enumerate(instructors):
+        if deadline is not None and time.monotonic() >= deadline:
+            logger.warning(
+                f"Lookup budget exhausted with {len(instructors) - index} "
+                "instructors left to rate"
+            )
+            break
+
         try:
             first_name, last_name, rating, rmp_id = get_instructor(instructor)
             rated[instructor] = {
@@ -45,11 +66,19 @@ def rate_instructors(instructors):
                 "rating": rating,
                 "rmpId": rmp_id,
             }
+        # Checked before ValueError, which requests' JSONDecodeError also subclasses, so
+        # a failed request is not mistaken for an instructor without a record
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Request for instructor '{instructor}' failed: {e}")
         except ValueError:
             logger.info(
                 f"RateMyProfessors found no record of instructor '{instructor}'"
             )
             rated[instructor] = {"fullName": instructor}
+        except Exception:
+            if not skip_errors:
+                raise
+            logger.exception(f"Error rating instructor '{instructor}'")
 
     return rated
 
@@ -74,19 +103,229 @@ def inject_rated_instructors(contents, rated_instructors):
     return contents
 
 
-def run():
-    latest_blob = storage.get_latest_blob()
-    contents = latest_blob.download_as_string()
+def decode_contents(contents):
+    """Decode the JSON bucket contents, exiting when they are not valid JSON
+
+    :param contents: The raw contents of the bucket
+    :return: The dictionary representing the JSON contents of the bucket
+    """
     try:
-        contents_json = json.loads(contents)
+        return json.loads(contents)
     except json.decoder.JSONDecodeError as e:
         logger.error(f"Error decoding JSON: {e}")
         exit()
 
+
+def get_deadline(budget):
+    """Get the deadline of the lookups that have to finish within a budget
+
+    The deadline leaves room for the last lookup to time out before the budget ends.
+
+    :param budget: The number of seconds the lookups may take
+    :return: The `time.monotonic` value after which no more instructors are rated
+    """
+    return time.monotonic() + budget - config.RMP_REQUEST_TIMEOUT
+
+
+def get_fetched_at(instructors):
+    """Get when the ratings of instructors were fetched from RateMyProfessors
+
+    :param instructors: Iterable of instructors rated by this process
+    :return: Dictionary of instructors and the timestamp their rating was fetched at
+    """
+    now = utils.get_current_timestamp()
+    fetched_at = {}
+    for instructor in instructors:
+        timestamp = RateMyProfessors.get_fetched_at(instructor)
+        fetched_at[instructor] = now if timestamp is None else timestamp
+
+    return fetched_at
+
+
+def rate_shard(instructors, deadline, skip_errors=False):
+    """Rate a shard of instructors and record when their ratings were fetched
+
+    :param instructors: List of instructors to rate
+    :param deadline: The `time.monotonic` value after which no more instructors are rated
+    :param skip_errors: Whether to leave instructors unrated on any error
+    :return: Dictionary of the rated instructors and when their ratings were fetched
+    """
+    rated_instructors = rate_instructors(instructors, deadline, skip_errors)
+    logger.info(f"Instructor cache statistics: {instructor_cache.stats()}")
+
+    return {
+        "instructors": rated_instructors,
+        "fetchedAt": get_fetched_at(rated_instructors),
+    }
+
+
+def rate_locally(shards, deadline):
+    """Rate shards of instructors in parallel local processes
+
+    :param shards: List of lists of instructors
+    :param deadline: The `time.monotonic` value after which no more instructors are rated
+    :return: Dictionary of the rated instructors and when their ratings were fetched
+    """
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        results = executor.map(rate_shard, shards, repeat(deadline))
+
+        return sharding.merge_results(results)
+
+
+def dispatch(source_blob_name, shards):
+    """Write a job and its shards of instructors to the work bucket
+
+    Every shard object triggers a worker invocation running `run_shard`.
+
+    :param source_blob_name: The name of the unprocessed blob the instructors are from
+    :param shards: List of lists of instructors
+    :return: The job identifier
+    """
+    job_id = sharding.generate_job_id()
+    bucket_name = config.WORK_BUCKET_NAME
+    job = {"source": source_blob_name, "shards": len(shards)}
+    storage.upload_json(bucket_name, sharding.job_blob_name(job_id), job)
+
+    for index, shard in enumerate(shards):
+        blob_name = sharding.shard_blob_name(job_id, index)
+        storage.upload_json(bucket_name, blob_name, {"instructors": shard})
+
+    logger.info(f"Dispatched job {job_id} with {len(shards)} shards")
+    return job_id
+
+
+def run_shard(blob_name):
+    """Rate the instructors of a shard, and merge the job once every shard is rated
+
+    Only the worker that claims the job by creating its merged blob merges it. The claim
+    is released when the merge fails, so a retried event can merge the job again.
+
+    :param blob_name: The name of the blob written to the work bucket
+    :return: None
+    """
+    parsed = sharding.parse_shard_blob_name(blob_name)
+
+    if parsed is None:
+        logger.debug(f"Ignoring {blob_name}, which is not a shard")
+        return
+
+    job_id, index = parsed
+    bucket_name = config.WORK_BUCKET_NAME
+    result_blob_name = sharding.result_blob_name(job_id, index)
+
+    # Storage triggers are delivered at least once, so a shard may be seen again
+    if storage.blob_exists(bucket_name, result_blob_name):
+        logger.info(f"Shard {index} of job {job_id} is already rated")
+    else:
+        # The last worker merges the job within the same invocation, so its lookups
+        # stop early enough to leave MERGE_BUDGET before the function times out
+        budget = min(
+            config.LOOKUP_BUDGET, config.FUNCTION_TIMEOUT - config.MERGE_BUDGET
+        )
+        deadline = get_deadline(budget)
+
+        # Errors still write a result, since the job is only merged once every shard
+        # has one. Lookups time out, so the result is written before the function does
+        try:
+            shard = storage.download_json(bucket_name, blob_name)
+            result = rate_shard(shard["instructors"], deadline, skip_errors=True)
+        except Exception:
+            logger.exception(f"Error rating shard {index} of job {job_id}")
+            result = {"instructors": {}, "fetchedAt": {}}
+
+        logger.info(f"Rated {len(result['instructors'])} instructors of shard {index}")
+        storage.upload_json(bucket_name, result_blob_name, result)
+
+    job = storage.download_json(bucket_name, sharding.job_blob_name(job_id))
+    completed = storage.count_blobs(bucket_name, sharding.results_prefix(job_id))
+
+    if completed < job["shards"]:
+        logger.info(f"Job {job_id} has {completed} of {job['shards']} shards rated")
+        return
+
+    merged_blob_name = sharding.merged_blob_name(job_id)
+    if not storage.create_json(bucket_name, merged_blob_name, {"shard": index}):
+        logger.info(f"Job {job_id} is already merged by another worker")
+        return
+
+    try:
+        merge(job_id, job)
+    except Exception:
+        logger.exception(f"Error merging job {job_id}, releasing its claim")
+        storage.delete_blob(bucket_name, merged_blob_name)
+        raise
+
+
+def merge(job_id, job):
+    """Assemble and publish the processed contents of a job from its shard results
+
+    :param job_id: The job identifier
+    :param job: The job written by `dispatch`
+    :return: None
+    """
+    bucket_name = config.WORK_BUCKET_NAME
+    results = (
+        storage.download_json(bucket_name, sharding.result_blob_name(job_id, index))
+        for index in range(job["shards"])
+    )
+    result = sharding.merge_results(results)
+
+    contents_json = storage.download_json(config.UNPROCESSED_BUCKET_NAME, job["source"])
+    logger.info(f"Merging job {job_id} from {job['shards']} shards")
+    publish_rated_instructors(contents_json, result, storage.get_cached_ratings())
+
+
+def publish_rated_instructors(contents_json, result, cached_ratings):
+    """Inject the rated instructors into the contents and publish them
+
+    :param contents_json: The dictionary representing the JSON contents of the bucket
+    :param result: Dictionary of the instructors rated during this run and when their
+                   ratings were fetched
+    :param cached_ratings: Dictionary of instructor names and their cached ratings
+    :return: None
+    """
+    rated_instructors = result["instructors"]
     instructors = get_instructors(contents_json)
-    logger.info(f"Found {len(instructors)} unique instructors")
+    course_counts = scheduler.count_courses(contents_json)
+    logger.info(
+        f"Rated {len(rated_instructors)} instructors covering "
+        f"{scheduler.coverage(rated_instructors, course_counts):.1f}% of courses"
+    )
 
-    rated_instructors = rate_instructors(instructors)
+    cached_ratings = scheduler.update_cached_ratings(
+        cached_ratings, rated_instructors, result["fetchedAt"]
+    )
+    storage.upload_cached_ratings(cached_ratings)
+    rated_instructors = scheduler.with_cached_ratings(
+        instructors, rated_instructors, cached_ratings
+    )
 
     processed_data = inject_rated_instructors(contents_json, rated_instructors)
-    storage.upload_to_bucket(processed_data)
+    storage.publish(processed_data)
+
+
+def run():
+    latest_blob = storage.get_latest_blob()
+    contents_json = decode_contents(latest_blob.download_as_string())
+
+    instructors = get_instructors(contents_json)
+    logger.info(f"Found {len(instructors)} unique instructors")
+
+    deadline = get_deadline(config.LOOKUP_BUDGET)
+    course_counts = scheduler.count_courses(contents_json)
+    cached_ratings = storage.get_cached_ratings()
+    ordered_instructors = scheduler.prioritize(
+        instructors, course_counts, cached_ratings
+    )
+
+    shards = sharding.split(ordered_instructors, config.SHARD_COUNT)
+
+    if len(shards) > 1 and config.SHARD_MODE == "local":
+        result = rate_locally(shards, deadline)
+    elif len(shards) > 1:
+        dispatch(latest_blob.name, shards)
+        return
+    else:
+        result = rate_shard(ordered_instructors, deadline)
+
+    publish_rated_instructors(contents_json, result, cached_ratings)
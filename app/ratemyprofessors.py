@@ -1,4 +1,7 @@
-import requests
+from app import config
+from app import utils
+from app.cache import LRUCache
+from app.transport import get_transport
 
 
 class RateMyProfessors:
@@ -8,6 +11,9 @@ class RateMyProfessors:
         "qf=teacherfirstname_t%5E2000+teacherlastname_t%5E2000+teacherfullname_t&fq=schoolname_t"
         "%3A%22Portland+State+University%22&fq=schoolid_s%3A775"
     )
+    # Created on first request, so an invalid transport configuration does not
+    # prevent the application from being imported
+    transport = None
 
     @staticmethod
     def get_instructor(instructor_name):
@@ -16,20 +22,42 @@ class RateMyProfessors:
         :param instructor_name: The name of the instructor to search for
         :return: The first and last name, as well as rating and RateMyProfessor ID
         """
-        if len(instructor_name.split()) == 3:
-            split = instructor_name.split()
-            del split[1]
+        instructor_name = normalize_name(instructor_name)
+        cached = instructor_cache.get(instructor_name)
 
-            instructor_name = " ".join(split)
+        if cached is None:
+            fetched_at = utils.get_current_timestamp()
+            json = RateMyProfessors.get_instructor_json(instructor_name)
+            try:
+                instructor = RateMyProfessors.parse_instructor_json(json)
+            except ValueError as e:
+                instructor = e
+            instructor_cache.put(instructor_name, (fetched_at, instructor))
+        else:
+            fetched_at, instructor = cached
 
-        instructor_name = uncommon_alias(instructor_name)
-        json = RateMyProfessors.get_instructor_json(instructor_name)
-        first_name, last_name, rating, rmp_id = RateMyProfessors.parse_instructor_json(
-            json
-        )
+        if isinstance(instructor, ValueError):
+            raise ValueError(str(instructor))
+
+        first_name, last_name, rating, rmp_id = instructor
 
         return first_name, last_name, rating, rmp_id
 
+    @staticmethod
+    def get_fetched_at(instructor_name):
+        """Gets when the memoized data of an instructor was fetched from RateMyProfessors
+
+        :param instructor_name: The name of the instructor
+        :return: The timestamp of the request, or None if the instructor is not memoized
+        """
+        cached = instructor_cache.peek(normalize_name(instructor_name))
+
+        if cached is None:
+            return None
+
+        fetched_at, instructor = cached
+        return fetched_at
+
     @staticmethod
     def get_instructor_json(instructor_name):
         """Gets the JSON representation of an instructor from the RateMyProfessors API
@@ -38,8 +66,11 @@ class RateMyProfessors:
         :return: The JSON response from the RateMyProfessors API
         """
         url = RateMyProfessors.url.format(instructor_name.replace(" ", "+"))
-        response = requests.get(url)
-        return response.json()
+
+        if RateMyProfessors.transport is None:
+            RateMyProfessors.transport = get_transport()
+
+        return RateMyProfessors.transport.get_json(url)
 
     @staticmethod
     def parse_instructor_json(data):
@@ -65,9 +96,29 @@ class RateMyProfessors:
         return first_name, last_name, rating, rmp_id
 
 
+# Memo of when instructors were fetched along with their parsed data, or the ValueError
+# raised when RateMyProfessors could not find them, kept across invocations on a warm
+# Cloud Function instance
+instructor_cache = LRUCache(config.INSTRUCTOR_CACHE_SIZE, config.INSTRUCTOR_CACHE_TTL)
+
 aliases = {"Barton": "Bart"}
 
 
+def normalize_name(instructor_name):
+    """Normalizes an instructor name before querying RateMyProfessors
+
+    :param instructor_name: The name of the instructor
+    :return: The name without middle name, with uncommon first names aliased
+    """
+    if len(instructor_name.split()) == 3:
+        split = instructor_name.split()
+        del split[1]
+
+        instructor_name = " ".join(split)
+
+    return uncommon_alias(instructor_name)
+
+
 def uncommon_alias(instructor_name):
     """Replaces names with their aliases before querying RateMyProfessors
 
@@ -0,0 +1,92 @@
+from collections import Counter
+
+from app import utils
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+def count_courses(contents):
+    """Count the courses that reference each instructor
+
+    :param contents: The dictionary representing the JSON contents of the bucket
+    :return: Counter of instructor names and the number of courses they teach
+    """
+    course_counts = Counter()
+    for term_code, term in contents.items():
+        for course in term:
+            course_counts[course.get("instructor", "TBD")] += 1
+
+    return course_counts
+
+
+def prioritize(instructors, course_counts, cached_ratings):
+    """Order instructors so the most valuable lookups happen first
+
+    Instructors without a cached rating come first. The rest are ordered by the
+    number of courses they teach, weighted by the age of their cached rating in days.
+
+    :param instructors: Set of instructors to rate
+    :param course_counts: Counter of instructor names and their number of courses
+    :param cached_ratings: Dictionary of instructor names and their cached ratings
+    :return: List of instructors in the order they should be rated
+    """
+    now = utils.get_current_timestamp()
+
+    def priority(instructor):
+        courses = course_counts.get(instructor, 0)
+        if instructor not in cached_ratings:
+            return (0, -courses, instructor)
+
+        age = max(now - cached_ratings[instructor]["ratedAt"], 0) / SECONDS_PER_DAY
+        return (1, -courses * (1 + age), instructor)
+
+    return sorted(instructors, key=priority)
+
+
+def coverage(rated_instructors, course_counts):
+    """Calculate the percentage of course rows whose instructor was rated
+
+    :param rated_instructors: Dictionary of instructors rated during this run
+    :param course_counts: Counter of instructor names and their number of courses
+    :return: The percentage of course rows covered by `rated_instructors`
+    """
+    total = sum(course_counts.values())
+    if total == 0:
+        return 100.0
+
+    covered = sum(course_counts[instructor] for instructor in rated_instructors)
+    return 100 * covered / total
+
+
+def update_cached_ratings(cached_ratings, rated_instructors, fetched_at):
+    """Store the instructors rated during this run in the ratings cache
+
+    :param cached_ratings: Dictionary of instructor names and their cached ratings
+    :param rated_instructors: Dictionary of instructors rated during this run
+    :param fetched_at: Dictionary of instructor names and when their rating was fetched
+    :return: The updated `cached_ratings`
+    """
+    now = utils.get_current_timestamp()
+    for instructor, rating in rated_instructors.items():
+        cached_ratings[instructor] = {
+            "ratedAt": fetched_at.get(instructor, now),
+            "instructor": rating,
+        }
+
+    return cached_ratings
+
+
+def with_cached_ratings(instructors, rated_instructors, cached_ratings):
+    """Fall back to cached ratings for the instructors that were not rated this run
+
+    :param instructors: Set of instructors found in the contents
+    :param rated_instructors: Dictionary of instructors rated during this run
+    :param cached_ratings: Dictionary of instructor names and their cached ratings
+    :return: Dictionary of instructors and their information
+    """
+    merged = dict(rated_instructors)
+    for instructor in instructors:
+        if instructor not in merged and instructor in cached_ratings:
+            merged[instructor] = cached_ratings[instructor]["instructor"]
+
+    return merged
@@ -0,0 +1,111 @@
+import re
+import uuid
+from collections import OrderedDict
+
+from app import utils
+
+JOB_DIRECTORY = "jobs"
+blob_name_pattern = re.compile(
+    rf"^{JOB_DIRECTORY}/(?P<job_id>[^/]+)/(?P<kind>shards|results)/(?P<index>\d+)\.json$"
+)
+
+
+def generate_job_id():
+    """Generates a unique identifier for a sharded job
+
+    :return: The job identifier, prefixed with the current date so jobs sort by age
+    """
+    date = utils.generate_filename().replace(".json", "")
+
+    return f"{date}-{uuid.uuid4().hex[:8]}"
+
+
+def split(instructors, shard_count):
+    """Split instructors into shards of similar priority
+
+    Instructors are dealt round-robin, so each shard gets its share of the most
+    valuable lookups when `instructors` is ordered by priority.
+
+    :param instructors: List of instructors ordered by priority
+    :param shard_count: The maximum number of shards to split the instructors into
+    :return: List of non-empty lists of instructors
+    """
+    assert shard_count > 0, f"Expected a positive shard count but got {shard_count}"
+    shards = [instructors[index::shard_count] for index in range(shard_count)]
+
+    return [shard for shard in shards if shard]
+
+
+def job_blob_name(job_id):
+    """Generates the name of the blob describing a job
+
+    :param job_id: The job identifier
+    :return: The blob name in the format jobs/job_id/job.json
+    """
+    return f"{JOB_DIRECTORY}/{job_id}/job.json"
+
+
+def merged_blob_name(job_id):
+    """Generates the name of the blob claiming the merge of a job
+
+    :param job_id: The job identifier
+    :return: The blob name in the format jobs/job_id/merged.json
+    """
+    return f"{JOB_DIRECTORY}/{job_id}/merged.json"
+
+
+def shard_blob_name(job_id, index):
+    """Generates the name of the blob holding the instructors of a shard
+
+    :param job_id: The job identifier
+    :param index: The index of the shard
+    :return: The blob name in the format jobs/job_id/shards/index.json
+    """
+    return f"{JOB_DIRECTORY}/{job_id}/shards/{index}.json"
+
+
+def result_blob_name(job_id, index):
+    """Generates the name of the blob holding the rated instructors of a shard
+
+    :param job_id: The job identifier
+    :param index: The index of the shard
+    :return: The blob name in the format jobs/job_id/results/index.json
+    """
+    return f"{JOB_DIRECTORY}/{job_id}/results/{index}.json"
+
+
+def results_prefix(job_id):
+    """Generates the prefix of the result blobs of a job
+
+    :param job_id: The job identifier
+    :return: The prefix in the format jobs/job_id/results/
+    """
+    return f"{JOB_DIRECTORY}/{job_id}/results/"
+
+
+def parse_shard_blob_name(blob_name):
+    """Parses the name of a shard blob
+
+    :param blob_name: The name of a blob in the work bucket
+    :return: The job identifier and shard index, or None if it is not a shard blob
+    """
+    match = blob_name_pattern.match(blob_name)
+
+    if match is None or match.group("kind") != "shards":
+        return None
+
+    return match.group("job_id"), int(match.group("index"))
+
+
+def merge_results(results):
+    """Merge the rated instructors of every shard
+
+    :param results: Iterable of shard results with rated instructors and fetch times
+    :return: The merged result of every shard
+    """
+    merged = {"instructors": OrderedDict(), "fetchedAt": {}}
+    for result in results:
+        merged["instructors"].update(result["instructors"])
+        merged["fetchedAt"].update(result["fetchedAt"])
+
+    return merged
@@ -1,8 +1,11 @@
 import json
+import os
 
+from google.api_core.exceptions import PreconditionFailed
 from google.cloud import storage
 
 from app import config
+from app import delta
 from app import utils
 from app.logger import logger
 
@@ -58,6 +61,274 @@ def upload_to_bucket(contents):
     logger.debug("File {} uploaded to {}.".format(renamed_filename, bucket_name))
 
 
+def list_versions(storage_client, bucket_name, term_code):
+    """Lists the full snapshots and deltas of a term in the processed bucket
+
+    :param storage_client: The Cloud Storage client
+    :param bucket_name: The name of the processed bucket
+    :param term_code: The term code to list the versions of
+    :return: List of blobs ordered from oldest to newest
+    """
+    blobs = storage_client.list_blobs(bucket_name, prefix=f"{term_code}/")
+
+    return sorted(blobs, key=lambda x: os.path.basename(x.name))
+
+
+def rebuild_version(versions):
+    """Rebuilds the contents of the newest version from its snapshot and deltas
+
+    :param versions: List of blobs ordered from oldest to newest
+    :return: The contents of the newest version, or None if there is no full snapshot
+    """
+    snapshot_indexes = [
+        index for index, blob in enumerate(versions) if not delta.is_delta(blob.name)
+    ]
+
+    if not snapshot_indexes:
+        return None
+
+    snapshot_index = snapshot_indexes[-1]
+    snapshot_blob, *delta_blobs = versions[snapshot_index:]
+    snapshot = json.loads(snapshot_blob.download_as_string())
+    deltas = (json.loads(blob.download_as_string()) for blob in delta_blobs)
+
+    return delta.rebuild(snapshot, deltas)
+
+
+def read_version(term_code, filename=None):
+    """Reads a version of the processed contents of a term
+
+    :param term_code: The term code to read
+    :param filename: The filename of the version to read, defaults to the newest version
+    :return: The contents of the version
+    """
+    storage_client = storage.Client()
+    versions = list_versions(storage_client, config.PROCESSED_BUCKET_NAME, term_code)
+
+    if filename is not None:
+        versions = [x for x in versions if os.path.basename(x.name) <= filename]
+
+        if not versions or os.path.basename(versions[-1].name) != filename:
+            raise ValueError(f"Version {filename} of term {term_code} does not exist.")
+
+    contents = rebuild_version(versions)
+
+    if contents is None:
+        raise ValueError(f"Term {term_code} has no full snapshot.")
+
+    return contents
+
+
+def publish(contents):
+    """Publishes contents as a delta against the previous version of the term.
+
+    A full snapshot is uploaded instead when the term has no snapshot yet, or when
+    `config.FULL_SNAPSHOT_INTERVAL` deltas have been uploaded since the last one.
+
+    :param contents: The contents to publish
+    :return: None
+    """
+    assert isinstance(contents, (dict)), f"Expected dict but got {type(contents)}"
+    storage_client = storage.Client()
+    bucket_name = config.PROCESSED_BUCKET_NAME
+    bucket = storage_client.lookup_bucket(bucket_name)
+
+    if bucket is None:
+        upload_to_bucket(contents)
+        return
+
+    term_code = next(iter(contents))
+    versions = list_versions(storage_client, bucket_name, term_code)
+    deltas_since_snapshot = 0
+    for blob in reversed(versions):
+        if not delta.is_delta(blob.name):
+            break
+        deltas_since_snapshot += 1
+
+    if (
+        deltas_since_snapshot == len(versions)
+        or deltas_since_snapshot >= config.FULL_SNAPSHOT_INTERVAL
+    ):
+        logger.debug(f"Publishing full snapshot of term {term_code}")
+        upload_to_bucket(contents)
+        return
+
+    previous = rebuild_version(versions)
+    contents_delta = delta.diff(previous, contents, base=versions[-1].name)
+
+    if delta.is_empty(contents_delta, previous):
+        logger.info(f"Term {term_code} is unchanged since {versions[-1].name}")
+        return
+
+    logger.info(
+        f"Publishing delta of term {term_code} with "
+        f"{sum(len(x) for x in contents_delta['added'].values())} added, "
+        f"{sum(len(x) for x in contents_delta['removed'].values())} removed and "
+        f"{sum(len(x) for x in contents_delta['changed'].values())} changed courses"
+    )
+    upload_delta(bucket, term_code, contents_delta)
+
+
+def upload_delta(bucket, term_code, contents_delta):
+    """Uploads a delta next to the full snapshots of a term.
+
+    :param bucket: The processed bucket
+    :param term_code: The term code the delta belongs to
+    :param contents_delta: The delta to put in the bucket
+    :return: None
+    """
+    filename = utils.generate_filename()
+    lambda_filename = write_lambda_file(filename, contents_delta)
+
+    blob_name = delta.delta_blob_name(term_code, filename)
+    blob = bucket.blob(blob_name)
+    blob.upload_from_filename(lambda_filename)
+
+    logger.debug("File {} uploaded to {}.".format(blob_name, bucket.name))
+
+
+def get_cached_ratings():
+    """Gets the cached instructor ratings from the processed bucket
+
+    :return: Dictionary of instructor names and their cached ratings
+    """
+    storage_client = storage.Client()
+    bucket = storage_client.lookup_bucket(config.PROCESSED_BUCKET_NAME)
+
+    if bucket is None:
+        return {}
+
+    blob = bucket.get_blob(config.RATINGS_CACHE_BLOB_NAME)
+
+    if blob is None:
+        logger.debug("Ratings cache does not exist.")
+        return {}
+
+    return json.loads(blob.download_as_string())
+
+
+def upload_cached_ratings(cached_ratings):
+    """Uploads the cached instructor ratings to the processed bucket
+
+    :param cached_ratings: Dictionary of instructor names and their cached ratings
+    :return: None
+    """
+    assert isinstance(
+        cached_ratings, dict
+    ), f"Expected dict but got {type(cached_ratings)}"
+    storage_client = storage.Client()
+    bucket_name = config.PROCESSED_BUCKET_NAME
+    bucket = storage_client.lookup_bucket(bucket_name)
+
+    if bucket is None:
+        bucket = storage_client.create_bucket(bucket_name)
+        logger.debug("Bucket {} created.".format(bucket.name))
+
+    blob = bucket.blob(config.RATINGS_CACHE_BLOB_NAME)
+    blob.upload_from_string(json.dumps(cached_ratings), content_type="application/json")
+
+    logger.debug(
+        "File {} uploaded to {}.".format(config.RATINGS_CACHE_BLOB_NAME, bucket_name)
+    )
+
+
+def download_json(bucket_name, blob_name):
+    """Downloads and decodes a JSON blob
+
+    :param bucket_name: The name of the bucket holding the blob
+    :param blob_name: The name of the blob
+    :return: The decoded contents of the blob
+    """
+    storage_client = storage.Client()
+    bucket = storage_client.bucket(bucket_name)
+    blob = bucket.blob(blob_name)
+
+    return json.loads(blob.download_as_string())
+
+
+def upload_json(bucket_name, blob_name, contents):
+    """Encodes and uploads contents to a JSON blob
+
+    :param bucket_name: The name of the bucket to upload to, created if missing
+    :param blob_name: The name of the blob
+    :param contents: The contents to put in the blob
+    :return: None
+    """
+    storage_client = storage.Client()
+    bucket = storage_client.lookup_bucket(bucket_name)
+
+    if bucket is None:
+        bucket = storage_client.create_bucket(bucket_name)
+        logger.debug("Bucket {} created.".format(bucket.name))
+
+    blob = bucket.blob(blob_name)
+    blob.upload_from_string(json.dumps(contents), content_type="application/json")
+
+    logger.debug("File {} uploaded to {}.".format(blob_name, bucket_name))
+
+
+def create_json(bucket_name, blob_name, contents):
+    """Encodes and uploads contents to a JSON blob, unless the blob already exists
+
+    :param bucket_name: The name of the bucket to upload to
+    :param blob_name: The name of the blob
+    :param contents: The contents to put in the blob
+    :return: True if the blob was created, False if it already existed
+    """
+    storage_client = storage.Client()
+    blob = storage_client.bucket(bucket_name).blob(blob_name)
+
+    try:
+        blob.upload_from_string(
+            json.dumps(contents),
+            content_type="application/json",
+            if_generation_match=0,
+        )
+    except PreconditionFailed:
+        logger.debug("File {} already exists in {}.".format(blob_name, bucket_name))
+        return False
+
+    logger.debug("File {} created in {}.".format(blob_name, bucket_name))
+    return True
+
+
+def blob_exists(bucket_name, blob_name):
+    """Checks whether a blob exists
+
+    :param bucket_name: The name of the bucket
+    :param blob_name: The name of the blob
+    :return: True if the blob exists
+    """
+    storage_client = storage.Client()
+
+    return storage_client.bucket(bucket_name).blob(blob_name).exists()
+
+
+def delete_blob(bucket_name, blob_name):
+    """Deletes a blob
+
+    :param bucket_name: The name of the bucket
+    :param blob_name: The name of the blob
+    :return: None
+    """
+    storage_client = storage.Client()
+    storage_client.bucket(bucket_name).blob(blob_name).delete()
+
+    logger.debug("File {} deleted from {}.".format(blob_name, bucket_name))
+
+
+def count_blobs(bucket_name, prefix):
+    """Counts the blobs in a bucket that start with a prefix
+
+    :param bucket_name: The name of the bucket
+    :param prefix: The prefix of the blob names
+    :return: The number of matching blobs
+    """
+    storage_client = storage.Client()
+
+    return sum(1 for _ in storage_client.list_blobs(bucket_name, prefix=prefix))
+
+
 def write_lambda_file(filename, contents):
     """Saves content to lambda filename.
 
@@ -0,0 +1,164 @@
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+
+from app import config
+from app.logger import logger
+
+
+class MissingResponseError(requests.exceptions.RequestException):
+    """Raised when a cassette has no recorded response for a URL"""
+
+
+class HttpTransport:
+    """Gets JSON responses over HTTP"""
+
+    def get_json(self, url):
+        """Gets the JSON response of a URL
+
+        :param url: The URL to request
+        :return: The decoded JSON response
+        """
+        response = requests.get(url, timeout=config.RMP_REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+
+class RecordingTransport:
+    """Gets JSON responses over HTTP and appends them to a cassette file"""
+
+    def __init__(self, cassette, transport=None):
+        """
+        :param cassette: The path of the cassette file to record to
+        :param transport: The transport making the requests
+        """
+        self.cassette = cassette
+        self.transport = transport or HttpTransport()
+        self.lock = threading.Lock()
+
+    def get_json(self, url):
+        """Gets the JSON response of a URL and records it
+
+        :param url: The URL to request
+        :return: The decoded JSON response
+        """
+        response = self.transport.get_json(url)
+
+        with self.lock:
+            with open(self.cassette, "a") as outfile:
+                write_interaction(outfile, url, response)
+
+        return response
+
+
+class ReplayTransport:
+    """Replays JSON responses from a cassette file with injected latency and errors"""
+
+    def __init__(self, cassette, latency=0, jitter=0, error_rate=0, seed=None):
+        """
+        :param cassette: The path of the cassette file to replay
+        :param latency: The number of seconds every response is delayed by
+        :param jitter: The maximum number of seconds randomly added to `latency`
+        :param error_rate: The probability of a request raising a ConnectionError
+        :param seed: The seed of the random jitter and errors
+        """
+        self.responses = load_cassette(cassette)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    def get_json(self, url):
+        """Replays the recorded JSON response of a URL
+
+        :param url: The URL to replay
+        :return: The recorded JSON response
+        """
+        with self.lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.error_rate
+
+        time.sleep(delay)
+
+        if failed:
+            raise requests.exceptions.ConnectionError(f"Injected error for {url}")
+
+        if url not in self.responses:
+            raise MissingResponseError(f"Cassette has no recorded response for {url}")
+
+        return self.responses[url]
+
+
+def write_interaction(outfile, url, response):
+    """Writes a recorded response as a line of a cassette file
+
+    :param outfile: The cassette file opened for writing
+    :param url: The requested URL
+    :param response: The JSON response of the URL
+    :return: None
+    """
+    outfile.write(json.dumps({"url": url, "response": response}) + "\n")
+
+
+def load_cassette(cassette):
+    """Loads the recorded responses of a cassette file
+
+    Cassettes hold one JSON interaction per line. When a URL was recorded more than
+    once, its latest response is kept.
+
+    :param cassette: The path of the cassette file
+    :return: Dictionary of URLs and their JSON responses
+    """
+    responses = {}
+    with open(cassette) as infile:
+        for line in infile:
+            if line.strip():
+                interaction = json.loads(line)
+                responses[interaction["url"]] = interaction["response"]
+
+    return responses
+
+
+def save_cassette(cassette, responses):
+    """Saves recorded responses to a cassette file
+
+    :param cassette: The path of the cassette file
+    :param responses: Dictionary of URLs and their JSON responses
+    :return: None
+    """
+    with open(cassette, "w") as outfile:
+        for url, response in responses.items():
+            write_interaction(outfile, url, response)
+
+
+def get_transport():
+    """Creates the transport selected by `config.RMP_TRANSPORT`
+
+    :return: A transport for the RateMyProfessors client
+    """
+    if config.RMP_TRANSPORT == "record":
+        logger.info(f"Recording RateMyProfessors responses to {config.RMP_CASSETTE}")
+        return RecordingTransport(config.RMP_CASSETTE)
+
+    if config.RMP_TRANSPORT == "replay":
+        if not os.path.exists(config.RMP_CASSETTE):
+            raise FileNotFoundError(
+                f"RMP_TRANSPORT is replay but the cassette {config.RMP_CASSETTE} "
+                "does not exist, record it first with RMP_TRANSPORT=record"
+            )
+
+        logger.info(f"Replaying RateMyProfessors responses from {config.RMP_CASSETTE}")
+        return ReplayTransport(
+            config.RMP_CASSETTE,
+            latency=config.RMP_REPLAY_LATENCY,
+            jitter=config.RMP_REPLAY_JITTER,
+            error_rate=config.RMP_REPLAY_ERROR_RATE,
+            seed=config.RMP_REPLAY_SEED,
+        )
+
+    return HttpTransport()
@@ -3,3 +3,7 @@ from app import main
 
 def transform(event, context):
     main.run()
+
+
+def transform_shard(event, context):
+    main.run_shard(event["name"])
@@ -0,0 +1,78 @@
+import unittest.mock as mock
+
+from app.cache import LRUCache
+
+
+def test_get_returns_default_when_missing():
+    cache = LRUCache(2, 60)
+
+    assert cache.get("Jane Doe") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_returns_cached_value():
+    cache = LRUCache(2, 60)
+    cache.put("Jane Doe", ("Jane", "Doe", 4.0, 12345))
+
+    assert cache.get("Jane Doe") == ("Jane", "Doe", 4.0, 12345)
+    assert cache.stats()["hits"] == 1
+
+
+def test_put_evicts_least_recently_used_entry():
+    cache = LRUCache(2, 60)
+    cache.put("Jane Doe", 1)
+    cache.put("John Doe", 2)
+    cache.get("Jane Doe")
+    cache.put("Bob", 3)
+
+    assert cache.get("John Doe") is None
+    assert cache.get("Jane Doe") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+@mock.patch("time.monotonic")
+def test_get_returns_default_when_expired(mock_monotonic):
+    cache = LRUCache(2, 60)
+    mock_monotonic.return_value = 0
+    cache.put("Jane Doe", 1)
+    mock_monotonic.return_value = 60
+
+    assert cache.get("Jane Doe") is None
+    assert cache.stats() == {
+        "hits": 0,
+        "misses": 1,
+        "evictions": 0,
+        "expirations": 1,
+        "size": 0,
+    }
+
+
+def test_peek_returns_value_without_updating_statistics():
+    cache = LRUCache(2, 60)
+    cache.put("Jane Doe", 1)
+
+    assert cache.peek("Jane Doe") == 1
+    assert cache.peek("John Doe") is None
+    assert cache.stats()["hits"] == 0
+    assert cache.stats()["misses"] == 0
+
+
+def test_invalidate_removes_entry():
+    cache = LRUCache(2, 60)
+    cache.put("Jane Doe", 1)
+    cache.put("John Doe", 2)
+
+    cache.invalidate("Jane Doe")
+
+    assert cache.get("Jane Doe") is None
+    assert cache.get("John Doe") == 2
+
+
+def test_invalidate_removes_all_entries():
+    cache = LRUCache(2, 60)
+    cache.put("Jane Doe", 1)
+    cache.put("John Doe", 2)
+
+    cache.invalidate()
+
+    assert cache.stats()["size"] == 0
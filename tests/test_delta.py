@@ -0,0 +1,147 @@
+from app import delta
+
+
+def test_is_delta_returns_true_for_delta_blob():
+    assert delta.is_delta("202001/deltas/20191020120000.json") is True
+
+
+def test_is_delta_returns_false_for_snapshot_blob():
+    assert delta.is_delta("202001/20191020120000.json") is False
+
+
+def test_course_key_uses_instructor_full_name_when_rated():
+    course = {"crn": 10883, "instructor": {"fullName": "Jane Doe", "rating": 4.0}}
+
+    assert delta.course_key(course) == "10883/Jane Doe"
+
+
+def test_index_courses_disambiguates_duplicate_keys():
+    courses = [
+        {"crn": 10883, "instructor": "Jane Doe"},
+        {"crn": 10883, "instructor": "Jane Doe"},
+    ]
+
+    indexed = delta.index_courses(courses)
+
+    assert list(indexed.keys()) == ["10883/Jane Doe", "10883/Jane Doe#2"]
+
+
+def test_diff_returns_empty_delta_when_unchanged():
+    contents = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+
+    contents_delta = delta.diff(contents, contents)
+
+    assert contents_delta["added"] == {}
+    assert contents_delta["removed"] == {}
+    assert contents_delta["changed"] == {}
+    assert contents_delta["order"] == {}
+
+
+def test_diff_returns_added_removed_and_changed_courses():
+    previous = {
+        "202001": [
+            {"crn": 1, "instructor": {"fullName": "Jane Doe", "rating": 4.0}},
+            {"crn": 2, "instructor": {"fullName": "John Doe"}},
+        ]
+    }
+    current = {
+        "202001": [
+            {"crn": 1, "instructor": {"fullName": "Jane Doe", "rating": 4.5}},
+            {"crn": 3, "instructor": {"fullName": "John Doe"}},
+        ]
+    }
+
+    contents_delta = delta.diff(previous, current, base="202001/1.json")
+
+    assert contents_delta["base"] == "202001/1.json"
+    assert contents_delta["terms"] == ["202001"]
+    assert contents_delta["added"] == {
+        "202001": {"3/John Doe": {"crn": 3, "instructor": {"fullName": "John Doe"}}}
+    }
+    assert contents_delta["removed"] == {"202001": ["2/John Doe"]}
+    assert contents_delta["changed"] == {
+        "202001": {
+            "1/Jane Doe": {
+                "crn": 1,
+                "instructor": {"fullName": "Jane Doe", "rating": 4.5},
+            }
+        }
+    }
+
+
+def test_apply_returns_current_contents():
+    previous = {
+        "202001": [
+            {"crn": 1, "instructor": "Jane Doe", "time": "10:00 - 11:50"},
+            {"crn": 2, "instructor": "John Doe"},
+        ],
+        "202002": [{"crn": 4, "instructor": "TBD"}],
+    }
+    current = {
+        "202001": [
+            {"crn": 1, "instructor": "Jane Doe", "time": "12:00 - 13:50"},
+            {"crn": 3, "instructor": "John Doe"},
+        ]
+    }
+
+    contents_delta = delta.diff(previous, current)
+
+    assert delta.apply(previous, contents_delta) == current
+
+
+def test_apply_returns_current_contents_when_row_inserted_mid_term():
+    previous = {
+        "202001": [{"crn": 1, "instructor": "A"}, {"crn": 2, "instructor": "B"}]
+    }
+    current = {
+        "202001": [
+            {"crn": 3, "instructor": "C"},
+            {"crn": 1, "instructor": "A"},
+            {"crn": 2, "instructor": "B"},
+        ]
+    }
+
+    contents_delta = delta.diff(previous, current)
+
+    assert delta.apply(previous, contents_delta) == current
+
+
+def test_apply_returns_current_contents_when_rows_reordered():
+    previous = {
+        "202001": [{"crn": 1, "instructor": "A"}, {"crn": 2, "instructor": "B"}]
+    }
+    current = {"202001": [{"crn": 2, "instructor": "B"}, {"crn": 1, "instructor": "A"}]}
+
+    contents_delta = delta.diff(previous, current)
+
+    assert contents_delta["order"] == {"202001": ["2/B", "1/A"]}
+    assert delta.apply(previous, contents_delta) == current
+
+
+def test_is_empty_returns_true_when_unchanged():
+    contents = {"202001": [{"crn": 1, "instructor": "A"}]}
+
+    assert delta.is_empty(delta.diff(contents, contents), contents) is True
+
+
+def test_is_empty_returns_false_when_rows_reordered():
+    previous = {
+        "202001": [{"crn": 1, "instructor": "A"}, {"crn": 2, "instructor": "B"}]
+    }
+    current = {"202001": [{"crn": 2, "instructor": "B"}, {"crn": 1, "instructor": "A"}]}
+
+    assert delta.is_empty(delta.diff(previous, current), previous) is False
+
+
+def test_rebuild_applies_deltas_in_order():
+    snapshot = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+    second = {
+        "202001": [
+            {"crn": 1, "instructor": "Jane Doe"},
+            {"crn": 2, "instructor": "Jane Doe"},
+        ]
+    }
+    third = {"202001": [{"crn": 2, "instructor": "Jane Doe", "credits": 4}]}
+    deltas = [delta.diff(snapshot, second), delta.diff(second, third)]
+
+    assert delta.rebuild(snapshot, deltas) == third
@@ -0,0 +1,50 @@
+import unittest.mock as mock
+
+from app import lookup
+from app import ratemyprofessors
+from app.ratemyprofessors import RateMyProfessors
+from app.transport import ReplayTransport
+from app.transport import save_cassette
+
+found = {
+    "response": {
+        "numFound": 1,
+        "docs": [
+            {
+                "teacherfirstname_t": "Jane",
+                "teacherlastname_t": "Doe",
+                "averageratingscore_rf": 4.0,
+                "pk_id": 12345,
+            }
+        ],
+    }
+}
+not_found = {"response": {"numFound": 0, "docs": []}}
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_run_lookups_replays_lookups_without_storage(mock_storage_client, tmp_path):
+    cassette = str(tmp_path / "cassette.jsonl")
+    save_cassette(
+        cassette,
+        {
+            RateMyProfessors.url.format("Jane+Doe"): found,
+            RateMyProfessors.url.format("John+Doe"): not_found,
+        },
+    )
+    contents = {
+        "202001": [
+            {"crn": 1, "instructor": "Jane Doe"},
+            {"crn": 2, "instructor": "Jane Doe"},
+            {"crn": 3, "instructor": "John Doe"},
+        ]
+    }
+    ratemyprofessors.instructor_cache.invalidate()
+
+    with mock.patch.object(RateMyProfessors, "transport", ReplayTransport(cassette)):
+        reports = lookup.run_lookups(contents, repeat=2)
+
+    assert [report["rated"] for report in reports] == [2, 2]
+    assert [report["coverage"] for report in reports] == [100.0, 100.0]
+    assert ratemyprofessors.instructor_cache.stats()["hits"] == 2
+    assert mock_storage_client.called is False
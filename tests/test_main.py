@@ -2,8 +2,13 @@ import unittest.mock as mock
 from collections import OrderedDict
 
 import pytest
+import requests
 
 from app import main
+from app import ratemyprofessors
+from app import scheduler
+from app import transport
+from app.ratemyprofessors import RateMyProfessors
 from tests import data
 
 
@@ -70,6 +75,47 @@ def test_rate_instructors_returns_rated_instructor_when_instructor_rating(
     }
 
 
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_rates_ordered_instructors_in_order(mock_get_instructor):
+    mock_get_instructor.side_effect = [
+        ("Jane", "Doe", 4.0, 12345),
+        ("John", "Doe", 3.5, 98765),
+    ]
+
+    rated_instructors = main.rate_instructors(["John Doe", "Jane Doe"])
+
+    assert list(rated_instructors.keys()) == ["John Doe", "Jane Doe"]
+    assert mock_get_instructor.call_args_list == [
+        mock.call("John Doe"),
+        mock.call("Jane Doe"),
+    ]
+
+
+@mock.patch("time.monotonic")
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_stops_at_deadline(mock_get_instructor, mock_monotonic):
+    mock_get_instructor.return_value = ("Jane", "Doe", 4.0, 12345)
+    mock_monotonic.side_effect = [0, 1, 2]
+
+    rated_instructors = main.rate_instructors(["Jane Doe", "John Doe", "Bob"], 2)
+
+    assert list(rated_instructors.keys()) == ["Jane Doe", "John Doe"]
+
+
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_leaves_instructor_unrated_when_request_fails(
+    mock_get_instructor,
+):
+    mock_get_instructor.side_effect = [
+        requests.exceptions.ConnectionError(),
+        ("John", "Doe", 3.5, 98765),
+    ]
+
+    rated_instructors = main.rate_instructors(["Jane Doe", "John Doe"])
+
+    assert list(rated_instructors.keys()) == ["John Doe"]
+
+
 @pytest.mark.skip(reason="Getting inconsistent result with the assertion")
 @mock.patch("app.main.get_instructor")
 def test_rate_instructors_returns_multiple_rated_instructors(mock_get_instructor):
@@ -178,3 +224,319 @@ def test_inject_rated_instructors_returns_contents_when_instructors_dont_match()
     main.inject_rated_instructors(contents, rated_instructors)
 
     assert contents == contents
+
+
+@mock.patch("app.storage.upload_json")
+def test_dispatch_uploads_job_and_shards(mock_upload_json):
+    job_id = main.dispatch("20191020120000.json", [["Alice", "John"], ["Bob"]])
+
+    uploads = {call[0][1]: call[0][2] for call in mock_upload_json.call_args_list}
+    assert uploads == {
+        f"jobs/{job_id}/job.json": {"source": "20191020120000.json", "shards": 2},
+        f"jobs/{job_id}/shards/0.json": {"instructors": ["Alice", "John"]},
+        f"jobs/{job_id}/shards/1.json": {"instructors": ["Bob"]},
+    }
+
+
+@mock.patch("app.storage.download_json")
+def test_run_shard_ignores_blobs_that_are_not_shards(mock_download_json):
+    main.run_shard("jobs/20191020120000-abcdef12/results/0.json")
+
+    assert mock_download_json.called is False
+
+
+@mock.patch("app.main.merge")
+@mock.patch("app.storage.count_blobs")
+@mock.patch("app.storage.upload_json")
+@mock.patch("app.storage.download_json")
+@mock.patch("app.storage.blob_exists")
+@mock.patch("app.main.get_instructor")
+def test_run_shard_uploads_result_without_merging_incomplete_job(
+    mock_get_instructor,
+    mock_blob_exists,
+    mock_download_json,
+    mock_upload_json,
+    mock_count_blobs,
+    mock_merge,
+):
+    mock_blob_exists.return_value = False
+    mock_get_instructor.return_value = ("Jane", "Doe", 4.0, 12345)
+    mock_download_json.side_effect = [
+        {"instructors": ["Jane Doe"]},
+        {"source": "20191020120000.json", "shards": 2},
+    ]
+    mock_count_blobs.return_value = 1
+
+    main.run_shard("jobs/20191020120000-abcdef12/shards/1.json")
+
+    blob_name, result = mock_upload_json.call_args[0][1:]
+    assert blob_name == "jobs/20191020120000-abcdef12/results/1.json"
+    assert list(result["instructors"].keys()) == ["Jane Doe"]
+    assert list(result["fetchedAt"].keys()) == ["Jane Doe"]
+    assert mock_merge.called is False
+
+
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_raises_unexpected_errors(mock_get_instructor):
+    mock_get_instructor.side_effect = KeyError("docs")
+
+    with pytest.raises(KeyError):
+        main.rate_instructors(["Jane Doe"])
+
+
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_skips_unexpected_errors_when_asked(mock_get_instructor):
+    mock_get_instructor.side_effect = [KeyError("docs"), ("John", "Doe", 3.5, 98765)]
+
+    rated_instructors = main.rate_instructors(
+        ["Jane Doe", "John Doe"], skip_errors=True
+    )
+
+    assert list(rated_instructors.keys()) == ["John Doe"]
+
+
+@mock.patch("app.main.merge")
+@mock.patch("app.storage.count_blobs")
+@mock.patch("app.storage.upload_json")
+@mock.patch("app.storage.download_json")
+@mock.patch("app.storage.blob_exists")
+def test_run_shard_uploads_empty_result_when_shard_fails(
+    mock_blob_exists,
+    mock_download_json,
+    mock_upload_json,
+    mock_count_blobs,
+    mock_merge,
+):
+    mock_blob_exists.return_value = False
+    mock_download_json.side_effect = [
+        ValueError("Invalid JSON"),
+        {"source": "20191020120000.json", "shards": 2},
+    ]
+    mock_count_blobs.return_value = 1
+
+    main.run_shard("jobs/20191020120000-abcdef12/shards/1.json")
+
+    blob_name, result = mock_upload_json.call_args[0][1:]
+    assert blob_name == "jobs/20191020120000-abcdef12/results/1.json"
+    assert result == {"instructors": {}, "fetchedAt": {}}
+
+
+@mock.patch("app.config.MERGE_BUDGET", 120)
+@mock.patch("app.config.FUNCTION_TIMEOUT", 540)
+@mock.patch("app.config.LOOKUP_BUDGET", 480)
+@mock.patch("app.main.rate_shard")
+@mock.patch("app.main.get_deadline")
+@mock.patch("app.storage.count_blobs")
+@mock.patch("app.storage.upload_json")
+@mock.patch("app.storage.download_json")
+@mock.patch("app.storage.blob_exists")
+def test_run_shard_leaves_merge_budget_before_function_timeout(
+    mock_blob_exists,
+    mock_download_json,
+    mock_upload_json,
+    mock_count_blobs,
+    mock_get_deadline,
+    mock_rate_shard,
+):
+    mock_blob_exists.return_value = False
+    mock_download_json.side_effect = [
+        {"instructors": ["Jane Doe"]},
+        {"source": "20191020120000.json", "shards": 2},
+    ]
+    mock_rate_shard.return_value = {"instructors": {}, "fetchedAt": {}}
+    mock_count_blobs.return_value = 1
+
+    main.run_shard("jobs/20191020120000-abcdef12/shards/1.json")
+
+    mock_get_deadline.assert_called_once_with(420)
+
+
+@mock.patch("app.main.merge")
+@mock.patch("app.storage.create_json")
+@mock.patch("app.storage.count_blobs")
+@mock.patch("app.storage.upload_json")
+@mock.patch("app.storage.download_json")
+@mock.patch("app.storage.blob_exists")
+@mock.patch("app.main.get_instructor")
+def test_run_shard_skips_rating_when_result_exists(
+    mock_get_instructor,
+    mock_blob_exists,
+    mock_download_json,
+    mock_upload_json,
+    mock_count_blobs,
+    mock_create_json,
+    mock_merge,
+):
+    job = {"source": "20191020120000.json", "shards": 2}
+    mock_blob_exists.return_value = True
+    mock_download_json.return_value = job
+    mock_count_blobs.return_value = 2
+    mock_create_json.return_value = True
+
+    main.run_shard("jobs/20191020120000-abcdef12/shards/1.json")
+
+    assert mock_get_instructor.called is False
+    assert mock_upload_json.called is False
+    mock_merge.assert_called_once_with("20191020120000-abcdef12", job)
+
+
+@mock.patch("app.main.merge")
+@mock.patch("app.storage.create_json")
+@mock.patch("app.storage.count_blobs")
+@mock.patch("app.storage.download_json")
+@mock.patch("app.storage.blob_exists")
+def test_run_shard_does_not_merge_job_claimed_by_another_worker(
+    mock_blob_exists,
+    mock_download_json,
+    mock_count_blobs,
+    mock_create_json,
+    mock_merge,
+):
+    mock_blob_exists.return_value = True
+    mock_download_json.return_value = {"source": "20191020120000.json", "shards": 2}
+    mock_count_blobs.return_value = 2
+    mock_create_json.return_value = False
+
+    main.run_shard("jobs/20191020120000-abcdef12/shards/1.json")
+
+    blob_name = mock_create_json.call_args[0][1]
+    assert blob_name == "jobs/20191020120000-abcdef12/merged.json"
+    assert mock_merge.called is False
+
+
+@mock.patch("app.storage.delete_blob")
+@mock.patch("app.main.merge")
+@mock.patch("app.storage.create_json")
+@mock.patch("app.storage.count_blobs")
+@mock.patch("app.storage.download_json")
+@mock.patch("app.storage.blob_exists")
+def test_run_shard_releases_claim_when_merge_fails(
+    mock_blob_exists,
+    mock_download_json,
+    mock_count_blobs,
+    mock_create_json,
+    mock_merge,
+    mock_delete_blob,
+):
+    mock_blob_exists.return_value = True
+    mock_download_json.return_value = {"source": "20191020120000.json", "shards": 2}
+    mock_count_blobs.return_value = 2
+    mock_create_json.return_value = True
+    mock_merge.side_effect = ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        main.run_shard("jobs/20191020120000-abcdef12/shards/1.json")
+
+    mock_delete_blob.assert_called_once_with(
+        "pdx-schedule-transform-work", "jobs/20191020120000-abcdef12/merged.json"
+    )
+
+
+@mock.patch("app.main.publish_rated_instructors")
+@mock.patch("app.storage.get_cached_ratings")
+@mock.patch("app.storage.download_json")
+def test_merge_publishes_merged_results(
+    mock_download_json, mock_get_cached_ratings, mock_publish_rated_instructors
+):
+    contents = {"202001": [{"instructor": "Alice"}, {"instructor": "Bob"}]}
+    mock_download_json.side_effect = [
+        {"instructors": {"Alice": {"fullName": "Alice"}}, "fetchedAt": {"Alice": 1}},
+        {"instructors": {"Bob": {"fullName": "Bob"}}, "fetchedAt": {"Bob": 2}},
+        contents,
+    ]
+    mock_get_cached_ratings.return_value = {}
+
+    main.merge("20191020120000-abcdef12", {"source": "source.json", "shards": 2})
+
+    mock_publish_rated_instructors.assert_called_once_with(
+        contents,
+        {
+            "instructors": {
+                "Alice": {"fullName": "Alice"},
+                "Bob": {"fullName": "Bob"},
+            },
+            "fetchedAt": {"Alice": 1, "Bob": 2},
+        },
+        {},
+    )
+
+
+@mock.patch("app.utils.get_current_timestamp")
+@mock.patch("app.ratemyprofessors.RateMyProfessors.get_fetched_at")
+def test_get_fetched_at_falls_back_to_now_when_not_memoized(
+    mock_get_fetched_at, mock_timestamp
+):
+    mock_get_fetched_at.side_effect = [1_000, None]
+    mock_timestamp.return_value = 2_000
+
+    fetched_at = main.get_fetched_at(["Jane Doe", "John Doe"])
+
+    assert fetched_at == {"Jane Doe": 1_000, "John Doe": 2_000}
+
+
+@mock.patch("app.main.logger")
+@mock.patch("app.main.get_instructor")
+def test_rate_shard_logs_instructor_cache_statistics(mock_get_instructor, mock_logger):
+    mock_get_instructor.return_value = ("Jane", "Doe", 4.0, 12345)
+
+    main.rate_shard(["Jane Doe"], None)
+
+    messages = [call[0][0] for call in mock_logger.info.call_args_list]
+    assert any(
+        message.startswith("Instructor cache statistics") for message in messages
+    )
+
+
+@mock.patch("app.config.RMP_REQUEST_TIMEOUT", 10)
+@mock.patch("time.monotonic")
+def test_get_deadline_leaves_room_for_last_lookup_to_time_out(mock_monotonic):
+    mock_monotonic.return_value = 100
+
+    assert main.get_deadline(480) == 570
+
+
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_leaves_instructor_unrated_when_timed_out(
+    mock_get_instructor,
+):
+    mock_get_instructor.side_effect = requests.exceptions.Timeout()
+
+    rated_instructors = main.rate_instructors(["Jane Doe"])
+
+    assert rated_instructors == {}
+
+
+@mock.patch("app.main.get_instructor")
+def test_rate_instructors_leaves_instructor_unrated_when_response_not_json(
+    mock_get_instructor,
+):
+    mock_get_instructor.side_effect = requests.exceptions.JSONDecodeError(
+        "Expecting value", "<html>", 0
+    )
+
+    rated_instructors = main.rate_instructors(["Jane Doe"])
+
+    assert rated_instructors == {}
+
+
+@mock.patch("requests.get")
+def test_rate_instructors_keeps_cached_rating_when_request_fails(mock_get):
+    response = requests.models.Response()
+    response.status_code = 503
+    response._content = b"<html>Service Unavailable</html>"
+    mock_get.return_value = response
+    ratemyprofessors.instructor_cache.invalidate()
+    cached_rating = {"fullName": "Jane Doe", "rating": 4.5}
+    cached_ratings = {"Jane Doe": {"ratedAt": 0, "instructor": cached_rating}}
+
+    http_transport = transport.HttpTransport()
+
+    with mock.patch.object(RateMyProfessors, "transport", http_transport):
+        rated_instructors = main.rate_instructors(["Jane Doe"])
+    scheduler.update_cached_ratings(cached_ratings, rated_instructors, {})
+
+    assert rated_instructors == {}
+    assert cached_ratings == {"Jane Doe": {"ratedAt": 0, "instructor": cached_rating}}
+    assert scheduler.with_cached_ratings(
+        {"Jane Doe"}, rated_instructors, cached_ratings
+    ) == {"Jane Doe": cached_rating}
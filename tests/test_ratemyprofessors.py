@@ -0,0 +1,126 @@
+import unittest.mock as mock
+
+import pytest
+
+from app import main
+from app import ratemyprofessors
+from app.ratemyprofessors import RateMyProfessors
+from app.transport import ReplayTransport
+from app.transport import save_cassette
+
+found = {
+    "response": {
+        "numFound": 1,
+        "docs": [
+            {
+                "teacherfirstname_t": "Jane",
+                "teacherlastname_t": "Doe",
+                "averageratingscore_rf": 4.0,
+                "pk_id": 12345,
+            }
+        ],
+    }
+}
+not_found = {"response": {"numFound": 0, "docs": []}}
+
+
+@pytest.fixture(autouse=True)
+def invalidate_instructor_cache():
+    ratemyprofessors.instructor_cache.invalidate()
+
+
+@mock.patch("app.ratemyprofessors.RateMyProfessors.get_instructor_json")
+def test_get_instructor_returns_parsed_instructor(mock_get_instructor_json):
+    mock_get_instructor_json.return_value = found
+
+    instructor = RateMyProfessors.get_instructor("Jane Doe")
+
+    assert instructor == ("Jane", "Doe", 4.0, 12345)
+
+
+@mock.patch("app.ratemyprofessors.RateMyProfessors.get_instructor_json")
+def test_get_instructor_memoizes_instructor(mock_get_instructor_json):
+    mock_get_instructor_json.return_value = found
+
+    RateMyProfessors.get_instructor("Jane Doe")
+    instructor = RateMyProfessors.get_instructor("Jane M Doe")
+
+    assert instructor == ("Jane", "Doe", 4.0, 12345)
+    assert mock_get_instructor_json.call_count == 1
+
+
+@mock.patch("app.utils.get_current_timestamp")
+@mock.patch("app.ratemyprofessors.RateMyProfessors.get_instructor_json")
+def test_get_fetched_at_returns_time_instructor_was_fetched(
+    mock_get_instructor_json, mock_timestamp
+):
+    mock_get_instructor_json.return_value = found
+    mock_timestamp.return_value = 1_000
+    RateMyProfessors.get_instructor("Jane Doe")
+    mock_timestamp.return_value = 2_000
+    RateMyProfessors.get_instructor("Jane Doe")
+
+    assert RateMyProfessors.get_fetched_at("Jane M Doe") == 1_000
+
+
+def test_get_fetched_at_returns_none_when_not_memoized():
+    assert RateMyProfessors.get_fetched_at("Jane Doe") is None
+
+
+@mock.patch("app.ratemyprofessors.RateMyProfessors.get_instructor_json")
+def test_get_instructor_memoizes_instructor_not_found(mock_get_instructor_json):
+    mock_get_instructor_json.return_value = not_found
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            RateMyProfessors.get_instructor("John Doe")
+
+    assert mock_get_instructor_json.call_count == 1
+
+
+@mock.patch("app.ratemyprofessors.RateMyProfessors.get_instructor_json")
+def test_get_instructor_does_not_memoize_request_errors(mock_get_instructor_json):
+    mock_get_instructor_json.side_effect = [ValueError("Invalid JSON"), found]
+
+    with pytest.raises(ValueError):
+        RateMyProfessors.get_instructor("Jane Doe")
+    instructor = RateMyProfessors.get_instructor("Jane Doe")
+
+    assert instructor == ("Jane", "Doe", 4.0, 12345)
+
+
+def test_get_instructor_replays_recorded_response(tmp_path):
+    cassette = str(tmp_path / "cassette.jsonl")
+    url = RateMyProfessors.url.format("Jane+Doe")
+    save_cassette(cassette, {url: found})
+
+    with mock.patch.object(RateMyProfessors, "transport", ReplayTransport(cassette)):
+        instructor = RateMyProfessors.get_instructor("Jane Doe")
+
+    assert instructor == ("Jane", "Doe", 4.0, 12345)
+
+
+def test_rate_instructors_leaves_replayed_errors_unrated(tmp_path):
+    cassette = str(tmp_path / "cassette.jsonl")
+    url = RateMyProfessors.url.format("Jane+Doe")
+    save_cassette(cassette, {url: found})
+    replay_transport = ReplayTransport(cassette, error_rate=1)
+
+    with mock.patch.object(RateMyProfessors, "transport", replay_transport):
+        rated_instructors = main.rate_instructors(["Jane Doe", "John Doe"])
+
+    assert rated_instructors == {}
+    assert ratemyprofessors.instructor_cache.stats()["size"] == 0
+
+
+@mock.patch("app.ratemyprofessors.get_transport")
+def test_get_instructor_json_creates_transport_on_first_request(mock_get_transport):
+    mock_get_transport().get_json.return_value = found
+
+    with mock.patch.object(RateMyProfessors, "transport", None):
+        assert RateMyProfessors.get_instructor_json("Jane Doe") == found
+        assert RateMyProfessors.transport is mock_get_transport()
+
+
+def test_uncommon_alias_replaces_first_name():
+    assert ratemyprofessors.uncommon_alias("Barton Massey") == "Bart Massey"
@@ -0,0 +1,86 @@
+import unittest.mock as mock
+
+from app import scheduler
+
+
+def test_count_courses_counts_courses_per_instructor():
+    contents = {
+        "202001": [{"instructor": "Alice"}, {"instructor": "Alice"}, {"name": "CS"}],
+        "202002": [{"instructor": "Bob"}, {"instructor": "Alice"}],
+    }
+
+    course_counts = scheduler.count_courses(contents)
+
+    assert course_counts == {"Alice": 3, "Bob": 1, "TBD": 1}
+
+
+@mock.patch("app.utils.get_current_timestamp")
+def test_prioritize_orders_uncached_instructors_first(mock_timestamp):
+    mock_timestamp.return_value = 1_000_000
+    course_counts = {"Alice": 5, "Bob": 1, "John": 3}
+    cached_ratings = {"Alice": {"ratedAt": 1_000_000, "instructor": {}}}
+
+    ordered = scheduler.prioritize(
+        {"Alice", "Bob", "John"}, course_counts, cached_ratings
+    )
+
+    assert ordered == ["John", "Bob", "Alice"]
+
+
+@mock.patch("app.utils.get_current_timestamp")
+def test_prioritize_weights_cached_instructors_by_staleness(mock_timestamp):
+    mock_timestamp.return_value = 10 * scheduler.SECONDS_PER_DAY
+    course_counts = {"Alice": 5, "Bob": 1}
+    cached_ratings = {
+        "Alice": {"ratedAt": 10 * scheduler.SECONDS_PER_DAY, "instructor": {}},
+        "Bob": {"ratedAt": 0, "instructor": {}},
+    }
+
+    ordered = scheduler.prioritize({"Alice", "Bob"}, course_counts, cached_ratings)
+
+    assert ordered == ["Bob", "Alice"]
+
+
+def test_coverage_returns_percentage_of_course_rows():
+    course_counts = {"Alice": 3, "Bob": 1}
+
+    assert scheduler.coverage({"Alice": {}}, course_counts) == 75.0
+
+
+def test_coverage_returns_full_coverage_when_no_courses():
+    assert scheduler.coverage({}, {}) == 100.0
+
+
+@mock.patch("app.utils.get_current_timestamp")
+def test_update_cached_ratings_stores_rated_instructors(mock_timestamp):
+    mock_timestamp.return_value = 1_000_000
+    cached_ratings = {"Bob": {"ratedAt": 0, "instructor": {"fullName": "Bob"}}}
+    rated_instructors = {
+        "Alice": {"fullName": "Alice"},
+        "John": {"fullName": "John"},
+    }
+
+    scheduler.update_cached_ratings(cached_ratings, rated_instructors, {"John": 500})
+
+    assert cached_ratings == {
+        "Alice": {"ratedAt": 1_000_000, "instructor": {"fullName": "Alice"}},
+        "Bob": {"ratedAt": 0, "instructor": {"fullName": "Bob"}},
+        "John": {"ratedAt": 500, "instructor": {"fullName": "John"}},
+    }
+
+
+def test_with_cached_ratings_falls_back_to_cached_rating():
+    rated_instructors = {"Alice": {"fullName": "Alice", "rating": 4.0}}
+    cached_ratings = {
+        "Alice": {"ratedAt": 0, "instructor": {"fullName": "Alice", "rating": 3.0}},
+        "Bob": {"ratedAt": 0, "instructor": {"fullName": "Bob", "rating": 2.0}},
+    }
+
+    merged = scheduler.with_cached_ratings(
+        {"Alice", "Bob", "John"}, rated_instructors, cached_ratings
+    )
+
+    assert merged == {
+        "Alice": {"fullName": "Alice", "rating": 4.0},
+        "Bob": {"fullName": "Bob", "rating": 2.0},
+    }
@@ -0,0 +1,46 @@
+from app import sharding
+
+
+def test_split_deals_instructors_round_robin():
+    shards = sharding.split(["Alice", "Bob", "John", "Jane", "Mark"], 2)
+
+    assert shards == [["Alice", "John", "Mark"], ["Bob", "Jane"]]
+
+
+def test_split_drops_empty_shards():
+    shards = sharding.split(["Alice", "Bob"], 4)
+
+    assert shards == [["Alice"], ["Bob"]]
+
+
+def test_split_returns_no_shards_when_no_instructors():
+    assert sharding.split([], 4) == []
+
+
+def test_parse_shard_blob_name_returns_job_id_and_index():
+    blob_name = sharding.shard_blob_name("20191020120000-abcdef12", 3)
+
+    parsed = sharding.parse_shard_blob_name(blob_name)
+
+    assert parsed == ("20191020120000-abcdef12", 3)
+
+
+def test_parse_shard_blob_name_returns_none_for_other_blobs():
+    job_id = "20191020120000-abcdef12"
+
+    assert sharding.parse_shard_blob_name(sharding.job_blob_name(job_id)) is None
+    assert sharding.parse_shard_blob_name(sharding.result_blob_name(job_id, 0)) is None
+
+
+def test_merge_results_merges_rated_instructors():
+    results = [
+        {"instructors": {"Alice": {"fullName": "Alice"}}, "fetchedAt": {"Alice": 1}},
+        {"instructors": {"Bob": {"fullName": "Bob"}}, "fetchedAt": {"Bob": 2}},
+    ]
+
+    merged = sharding.merge_results(results)
+
+    assert merged == {
+        "instructors": {"Alice": {"fullName": "Alice"}, "Bob": {"fullName": "Bob"}},
+        "fetchedAt": {"Alice": 1, "Bob": 2},
+    }
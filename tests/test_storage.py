@@ -1,7 +1,12 @@
+import json
 import unittest.mock as mock
 from datetime import datetime
 from datetime import timedelta
 
+import pytest
+from google.api_core.exceptions import PreconditionFailed
+
+from app import delta
 from app import storage
 
 
@@ -94,3 +99,151 @@ def test_write_lambda_file_returns_filename():
     lambda_filename = storage.write_lambda_file(filename, contents)
 
     assert lambda_filename == "/tmp/test-filename"
+
+
+def make_blob(name, contents):
+    blob = mock.Mock()
+    blob.name = name
+    blob.download_as_string.return_value = json.dumps(contents)
+    return blob
+
+
+@mock.patch("app.storage.upload_to_bucket")
+@mock.patch("google.cloud.storage.Client")
+def test_publish_uploads_snapshot_when_no_previous_snapshot(
+    mock_storage_client, mock_upload_to_bucket
+):
+    mock_storage_client().list_blobs.return_value = []
+    contents = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+
+    storage.publish(contents)
+
+    mock_upload_to_bucket.assert_called_once_with(contents)
+
+
+@mock.patch("app.config.FULL_SNAPSHOT_INTERVAL", 1)
+@mock.patch("app.storage.upload_to_bucket")
+@mock.patch("google.cloud.storage.Client")
+def test_publish_uploads_snapshot_when_interval_reached(
+    mock_storage_client, mock_upload_to_bucket
+):
+    snapshot = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+    mock_storage_client().list_blobs.return_value = [
+        make_blob("202001/deltas/20191020120000.json", {}),
+        make_blob("202001/20191019120000.json", snapshot),
+    ]
+
+    storage.publish(snapshot)
+
+    mock_upload_to_bucket.assert_called_once_with(snapshot)
+
+
+@mock.patch("app.storage.write_lambda_file")
+@mock.patch("app.storage.upload_to_bucket")
+@mock.patch("google.cloud.storage.Client")
+def test_publish_uploads_delta_against_previous_snapshot(
+    mock_storage_client, mock_upload_to_bucket, mock_write_lambda_file
+):
+    snapshot = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+    contents = {"202001": [{"crn": 2, "instructor": "Jane Doe"}]}
+    mock_storage_client().list_blobs.return_value = [
+        make_blob("202001/20191019120000.json", snapshot)
+    ]
+
+    storage.publish(contents)
+
+    assert mock_upload_to_bucket.called is False
+    contents_delta = mock_write_lambda_file.call_args[0][1]
+    assert contents_delta["base"] == "202001/20191019120000.json"
+    assert delta.apply(snapshot, contents_delta) == contents
+    blob_name = mock_storage_client().lookup_bucket().blob.call_args[0][0]
+    assert blob_name.startswith("202001/deltas/")
+
+
+@mock.patch("app.storage.write_lambda_file")
+@mock.patch("app.storage.upload_to_bucket")
+@mock.patch("google.cloud.storage.Client")
+def test_publish_skips_upload_when_unchanged(
+    mock_storage_client, mock_upload_to_bucket, mock_write_lambda_file
+):
+    snapshot = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+    mock_storage_client().list_blobs.return_value = [
+        make_blob("202001/20191019120000.json", snapshot)
+    ]
+
+    storage.publish(snapshot)
+
+    assert mock_upload_to_bucket.called is False
+    assert mock_write_lambda_file.called is False
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_read_version_rebuilds_version_from_snapshot_and_deltas(mock_storage_client):
+    snapshot = {"202001": [{"crn": 1, "instructor": "Jane Doe"}]}
+    second = {"202001": [{"crn": 2, "instructor": "Jane Doe"}]}
+    third = {"202001": [{"crn": 3, "instructor": "Jane Doe"}]}
+    mock_storage_client().list_blobs.return_value = [
+        make_blob("202001/deltas/20191021120000.json", delta.diff(second, third)),
+        make_blob("202001/20191019120000.json", snapshot),
+        make_blob("202001/deltas/20191020120000.json", delta.diff(snapshot, second)),
+    ]
+
+    assert storage.read_version("202001", "20191020120000.json") == second
+    assert storage.read_version("202001") == third
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_read_version_raises_when_version_does_not_exist(mock_storage_client):
+    mock_storage_client().list_blobs.return_value = [
+        make_blob("202001/20191019120000.json", {})
+    ]
+
+    with pytest.raises(ValueError):
+        storage.read_version("202001", "20191020120000.json")
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_get_cached_ratings_returns_empty_dict_when_no_cache(mock_storage_client):
+    mock_storage_client().lookup_bucket().get_blob.return_value = None
+
+    assert storage.get_cached_ratings() == {}
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_get_cached_ratings_returns_cached_ratings(mock_storage_client):
+    cached_ratings = {"Alice": {"ratedAt": 0, "instructor": {"fullName": "Alice"}}}
+    mock_storage_client().lookup_bucket().get_blob.return_value = make_blob(
+        "cache/ratings.json", cached_ratings
+    )
+
+    assert storage.get_cached_ratings() == cached_ratings
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_upload_cached_ratings_uploads_json(mock_storage_client):
+    cached_ratings = {"Alice": {"ratedAt": 0, "instructor": {"fullName": "Alice"}}}
+
+    storage.upload_cached_ratings(cached_ratings)
+
+    blob = mock_storage_client().lookup_bucket().blob()
+    assert json.loads(blob.upload_from_string.call_args[0][0]) == cached_ratings
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_create_json_creates_blob_only_if_missing(mock_storage_client):
+    blob = mock_storage_client().bucket().blob()
+
+    created = storage.create_json("work-bucket", "jobs/1/merged.json", {"shard": 0})
+
+    assert created is True
+    assert blob.upload_from_string.call_args[1]["if_generation_match"] == 0
+
+
+@mock.patch("google.cloud.storage.Client")
+def test_create_json_returns_false_when_blob_exists(mock_storage_client):
+    blob = mock_storage_client().bucket().blob()
+    blob.upload_from_string.side_effect = PreconditionFailed("exists")
+
+    created = storage.create_json("work-bucket", "jobs/1/merged.json", {"shard": 0})
+
+    assert created is False
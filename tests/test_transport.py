@@ -0,0 +1,125 @@
+import unittest.mock as mock
+
+import pytest
+import requests
+
+from app import transport
+
+url = "https://search-production.ratemyprofessors.com/solr/rmp/select/?q=Jane+Doe"
+response = {"response": {"numFound": 0, "docs": []}}
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    cassette = str(tmp_path / "cassette.jsonl")
+    transport.save_cassette(cassette, {url: response})
+    return cassette
+
+
+@mock.patch("requests.get")
+def test_http_transport_returns_json_response(mock_get):
+    mock_get().json.return_value = response
+
+    assert transport.HttpTransport().get_json(url) == response
+
+
+@mock.patch("app.config.RMP_REQUEST_TIMEOUT", 5)
+@mock.patch("requests.get")
+def test_http_transport_requests_with_timeout(mock_get):
+    transport.HttpTransport().get_json(url)
+
+    assert mock_get.call_args[1]["timeout"] == 5
+
+
+@mock.patch("requests.get")
+def test_http_transport_raises_on_error_status(mock_get):
+    mock_get().raise_for_status.side_effect = requests.exceptions.HTTPError("503")
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        transport.HttpTransport().get_json(url)
+
+
+def test_recording_transport_records_response_to_cassette(tmp_path):
+    cassette = str(tmp_path / "cassette.jsonl")
+    http_transport = mock.Mock()
+    http_transport.get_json.return_value = response
+
+    recorded = transport.RecordingTransport(cassette, http_transport).get_json(url)
+
+    assert recorded == response
+    assert transport.load_cassette(cassette) == {url: response}
+
+
+def test_recording_transport_appends_responses_to_cassette(cassette):
+    other_url = f"{url}+Smith"
+    http_transport = mock.Mock()
+    http_transport.get_json.return_value = {"response": {"numFound": 1}}
+
+    transport.RecordingTransport(cassette, http_transport).get_json(other_url)
+
+    with open(cassette) as infile:
+        assert len(infile.readlines()) == 2
+    assert transport.load_cassette(cassette) == {
+        url: response,
+        other_url: {"response": {"numFound": 1}},
+    }
+
+
+def test_replay_transport_replays_recorded_response(cassette):
+    assert transport.ReplayTransport(cassette).get_json(url) == response
+
+
+def test_replay_transport_raises_when_response_not_recorded(cassette):
+    with pytest.raises(transport.MissingResponseError):
+        transport.ReplayTransport(cassette).get_json(f"{url}+Smith")
+
+
+@mock.patch("time.sleep")
+def test_replay_transport_delays_response(mock_sleep, cassette):
+    transport.ReplayTransport(cassette, latency=0.25, jitter=0.5, seed=1).get_json(url)
+
+    delay = mock_sleep.call_args[0][0]
+    assert 0.25 <= delay <= 0.75
+
+
+def test_replay_transport_injects_errors(cassette):
+    replay_transport = transport.ReplayTransport(cassette, error_rate=1)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        replay_transport.get_json(url)
+
+
+@mock.patch("app.config.RMP_TRANSPORT", "replay")
+def test_get_transport_returns_replay_transport(cassette):
+    with mock.patch("app.config.RMP_CASSETTE", cassette):
+        assert isinstance(transport.get_transport(), transport.ReplayTransport)
+
+
+@mock.patch("app.config.RMP_TRANSPORT", "replay")
+def test_get_transport_raises_when_replay_cassette_does_not_exist(tmp_path):
+    with mock.patch("app.config.RMP_CASSETTE", str(tmp_path / "missing.jsonl")):
+        with pytest.raises(FileNotFoundError):
+            transport.get_transport()
+
+
+@mock.patch("app.config.RMP_REPLAY_ERROR_RATE", 0.5)
+@mock.patch("app.config.RMP_REPLAY_SEED", "42")
+@mock.patch("app.config.RMP_TRANSPORT", "replay")
+def test_get_transport_replays_same_errors_with_seed(cassette):
+    def replay():
+        replay_transport = transport.get_transport()
+        failures = []
+        for _ in range(20):
+            try:
+                replay_transport.get_json(url)
+                failures.append(False)
+            except requests.exceptions.ConnectionError:
+                failures.append(True)
+        return failures
+
+    with mock.patch("app.config.RMP_CASSETTE", cassette):
+        assert replay() == replay()
+
+
+def test_get_transport_returns_http_transport_by_default():
+    assert isinstance(transport.get_transport(), transport.HttpTransport)